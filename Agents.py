@@ -1,12 +1,19 @@
 import numpy as np
-from enum import Enum
-from typing import Callable
+from numpy.lib.stride_tricks import sliding_window_view
+from enum import IntEnum
+from typing import Callable, TYPE_CHECKING
 from abc import ABC, abstractmethod
+from collections import deque
 from WorldEvents import post
 import math
 import heapq
 import random
 import operator
+from numba import njit
+
+# World imports this module, so RoadGraph is only imported for annotations
+if TYPE_CHECKING:
+    from World import RoadGraph
 
 
 """
@@ -24,28 +31,259 @@ Agent types include Civilians, Paramedics, and Firefighters, each with distinct
 behaviors and priorities during emergency scenarios.
 """
 
+# Agent state codes. Patterns and health states are stored on agents (and in the AgentPool) as these plain ints, so
+# state checks in the per-tick logic are a single int compare. The Pattern/HealthState IntEnums on each class alias
+# the same values for readability and for code outside this module.
+
+# Civilian patterns
+WANDER: int = 1
+FLEE: int = 2
+SAFE: int = 3
+
+# Civilian health states
+HEALTHY: int = 1
+SICK: int = 2
+INJURED: int = 3
+GRAVELY_INJURED: int = 4
+DECEASED: int = 5
+
+# Paramedic patterns
+STANDBY: int = 1
+DISPATCHED: int = 2
+
+# How many finished paths each road graph remembers (see Agent.find_path)
+PATH_CACHE_SIZE: int = 8192
+
+# The 8 cells around the centre (3, 3) of an agent's 7x7 perception, in the order follow_path prefers them on ties
+NEIGHBOURS: tuple = ((2, 2), (2, 3), (2, 4), (3, 2), (4, 2), (3, 4), (4, 4), (4, 3))
+
+# NEIGHBOUR_ORDER[py][px] holds NEIGHBOURS sorted by Chebyshev distance to perception cell (py, px), ties kept in
+# NEIGHBOURS order. Computed for the whole 7x7 perception at once, so follow_path can take the first free cell
+# instead of scoring all 8
+_perception_range: np.ndarray = np.arange(7)
+_neighbour_array: np.ndarray = np.array(NEIGHBOURS)
+_neighbour_heuristics: np.ndarray = np.maximum(np.abs(_perception_range[:, None, None] - _neighbour_array[:, 0]),
+                                               np.abs(_perception_range[None, :, None] - _neighbour_array[:, 1]))
+NEIGHBOUR_ORDER: list = [[tuple(NEIGHBOURS[k] for k in np.argsort(_neighbour_heuristics[py, px], kind="stable"))
+                          for px in range(7)] for py in range(7)]
+
+# A* works on the road graph's CSR arrays (see World.RoadGraph). Heap entries pack the f-score above the
+# node id, ((f << 32) | id), so a single int compare orders by f-score and breaks ties in (y, x) order.
+
+@njit(cache=True)
+def _heap_push(heap: np.ndarray, size: int, key: int) -> int:
+    """
+    Pushes a key onto a binary min-heap stored in the first `size` slots of `heap`.
+
+    Returns:
+        int: The new heap size
+    """
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] <= key:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = key
+    return size + 1
+
+
+@njit(cache=True)
+def _heap_pop(heap: np.ndarray, size: int) -> int:
+    """
+    Removes the smallest key from a binary min-heap stored in the first `size` slots of `heap`.
+    The caller is responsible for decrementing its heap size.
+
+    Returns:
+        int: The smallest key
+    """
+    top = heap[0]
+    size -= 1
+    last = heap[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if last <= heap[child]:
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = last
+    return top
+
+
+@njit(cache=True)
+def _astar(start_id: int, target_id: int, indptr: np.ndarray, indices: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """
+    Compiled A* search between two road graph node ids.
+
+    Args:
+        start_id: Node id the search starts from
+        target_id: Node id the search is looking for
+        indptr, indices: CSR adjacency of the road graph
+        coords: (num_nodes, 2) array of node coordinates, used for the Chebyshev heuristic
+
+    Returns:
+        np.ndarray: came_from array mapping each node id to its predecessor id (-1 if none).
+            came_from[target_id] stays -1 if the target is unreachable.
+
+    #Note: this stays a one-directional search. Ties are broken by node id, which decides which of several equally short
+    #routes an agent takes, and a bidirectional search would pick different ones (and change how crowds form)
+    """
+    num_nodes = indptr.shape[0] - 1
+    target_y = coords[target_id, 0]
+    target_x = coords[target_id, 1]
+
+    #HAD TO LEARN GSCORE TRACKING PATTERN, MY ORIGINAL SOLUTION WAS SO SCUFFED
+    # num_nodes + 1 is further than any real path
+    g_score = np.full(num_nodes, num_nodes + 1, dtype=np.int32)
+    came_from = np.full(num_nodes, -1, dtype=np.int32)
+    closed = np.zeros(num_nodes, dtype=np.bool_)
+
+    # every edge is relaxed at most once (nodes are only expanded once), so this can never overflow
+    heap = np.empty(indices.shape[0] + 1, dtype=np.int64)
+    heap_size = _heap_push(heap, 0, np.int64(start_id))
+    g_score[start_id] = 0
+
+    while heap_size > 0:
+        current = _heap_pop(heap, heap_size) & 0xFFFFFFFF
+        heap_size -= 1
+
+        if closed[current]:
+            continue
+        closed[current] = True
+
+        if current == target_id:
+            break
+
+        tentative_g = g_score[current] + 1
+
+        for j in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[j]
+            if not closed[neighbor] and tentative_g < g_score[neighbor]:
+                # computed inline on purpose: compiled, this is as cheap as loading it from a per-target lookup table
+                heuristic = max(abs(coords[neighbor, 0] - target_y), abs(coords[neighbor, 1] - target_x))
+                g_score[neighbor] = tentative_g
+                heap_size = _heap_push(heap, heap_size, (np.int64(tentative_g + heuristic) << 32) | neighbor)
+                came_from[neighbor] = current
+
+    return came_from
+
+
+@njit(cache=True)
+def _walk_came_from(came_from: np.ndarray, target_id: int) -> np.ndarray:
+    """
+    Compiled walk of an _astar came_from array back from the target.
+
+    Args:
+        came_from: Array mapping each node id to its predecessor's id (-1 for the start)
+        target_id: Node id the path ends at
+
+    Returns:
+        np.ndarray: int32 array of the node ids on the path, ordered start->target
+    """
+    length = 1
+    node = target_id
+    while came_from[node] != -1:
+        node = came_from[node]
+        length += 1
+
+    # filled from the back, so no reversing needed
+    path = np.empty(length, dtype=np.int32)
+    node = target_id
+    for i in range(length - 1, -1, -1):
+        path[i] = node
+        node = came_from[node]
+    return path
+
+
+@njit(cache=True)
+def _count_perceived_civilians(occupant_id: np.ndarray, civilian: np.ndarray, pattern: np.ndarray, health: np.ndarray,
+                               self_id: int) -> tuple:
+    """
+    Compiled count of the civilians in a perception window, read from the AgentPool's columns.
+
+    Args:
+        occupant_id: 7x7 window of occupant pool ids (-1 for empty cells)
+        civilian, pattern, health: the AgentPool's civilian, pattern and health columns
+        self_id: pool id of the perceiving agent, left out of the crowd count
+
+    Returns:
+        tuple: (fleeing, casualties, crowd) where fleeing counts civilians that are FLEEing, casualties counts
+            GRAVELY_INJURED or DECEASED civilians, and crowd counts living civilians other than the perceiving agent
+    """
+    fleeing = 0
+    casualties = 0
+    crowd = 0
+    for y in range(occupant_id.shape[0]):
+        for x in range(occupant_id.shape[1]):
+            occupant = occupant_id[y, x]
+            if occupant < 0 or not civilian[occupant]:
+                continue
+            if pattern[occupant] == FLEE:
+                fleeing += 1
+            if health[occupant] == GRAVELY_INJURED or health[occupant] == DECEASED:
+                casualties += 1
+            if occupant != self_id and health[occupant] != DECEASED:
+                crowd += 1
+    return fleeing, casualties, crowd
+
+# Civilians only start counting what they perceive once a disaster happens, so without this the kernel would be compiled
+# (or loaded from the cache) mid-simulation, stalling the disaster tick. Called once here with arguments typed like the
+# real ones: a read-only 7x7 window of the World's int32 occupant grid, and the AgentPool's columns
+_count_perceived_civilians(sliding_window_view(np.full((8, 8), -1, dtype=np.int32), (7, 7))[0, 0],
+                           np.zeros(1, dtype=bool), np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.int8), -1)
+
+
 class Agent(ABC):
 
     disaster_loc: tuple = None #type: ignore
+    # True for every map cell with a disaster inside its 7x7 perception, kept up to date by the World
+    disaster_nearby: np.ndarray = None #type: ignore
 
-    def __init__(self, location: tuple, road_graph: dict, target: tuple):
+    # set when the agent is registered with an AgentPool (see AgentPool.register)
+    pool: "AgentPool" = None #type: ignore
+    id: int = -1
+
+    def __init__(self, location: tuple, road_graph: "RoadGraph", target: tuple):
         """
         Initializes a base Agent with pathfinding capabilities.
         
         Args:
             location: Tuple (y, x) representing initial position on the grid
-            road_graph: Dict mapping road cell coordinates to list of neighboring road cells
+            road_graph: RoadGraph of the map's road cells (adjacency dict plus the CSR arrays and path cache pathfinding reads)
             target: Tuple (y, x) representing the agent's destination
         
         Side Effects:
-            - Calculates initial path to target using A* pathfinding
+            - Calculates initial path to target using A* pathfinding, unless the agent starts on it
         """
 
         self.location: tuple = location
-        self.perception: np.ndarray = None # type: ignore
-        self.road_graph: dict = road_graph
+        # views of the 7x7 window around this agent, read straight from the World's grids (see World.set_perception)
+        self.perception_is_road: np.ndarray = None # type: ignore
+        self.perception_disaster: np.ndarray = None # type: ignore
+        self.perception_occupied: np.ndarray = None # type: ignore
+        self.perception_occupant_id: np.ndarray = None # type: ignore
+        self.road_graph: "RoadGraph" = road_graph
         self.target = target
-        self.path = self.find_path(self.target)
+        # nothing to plan if the agent spawned on its target (paramedics always do, see Paramedic.find_target)
+        self.path: deque[tuple] = deque() if target == location else self.find_path(self.target)
+
+    # pattern is written through to this agent's AgentPool row so the pool's pattern column never goes stale
+    # (see AgentPool.active_mask). Reads go through the property too, so they cost a getter call
+    @property
+    def pattern(self) -> int:
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, pattern: int) -> None:
+        self._pattern = pattern
+        if self.pool is not None:
+            self.pool.pattern[self.id] = pattern
 
     @abstractmethod
     def update(self):
@@ -62,7 +300,7 @@ class Agent(ABC):
         pass
 
     # calculates this agent's path to a target
-    def find_path(self, target: tuple) -> list[tuple]:
+    def find_path(self, target: tuple) -> deque[tuple]:
 
         """
         Calculates the optimal path from the agent's current location to a target using A* algorithm.
@@ -75,70 +313,60 @@ class Agent(ABC):
             target: Tuple (y, x) representing the destination coordinates on the grid
         
         Returns:
-            list: Ordered list of tuples [(y1, x1), (y2, x2), ...] representing the path
-                from current location to target. Returns empty list if no path exists.
+            deque: Ordered tuples [(y1, x1), (y2, x2), ...] representing the path from current location
+                to target, a deque so follow_path can pop steps off the front cheaply. Empty if no path exists.
                 
         Implementation:
-            - Maintains g_score dict tracking best known distance from start to each node
-            - Uses min-heap priority queue for efficient node exploration
-            - came_from dict enables path reconstruction after target is found
+            - Works on the road graph's integer node ids rather than (y, x) tuples
+            - The search itself runs in the compiled _astar function over the graph's CSR arrays
+            - The came_from array it returns is walked back into (y, x) tuples by finish_path
+            - Finished paths are kept in the road graph's path_cache, so repeated (start, target) pairs skip the search
         """
-        
-        #HAD TO LEARN GSCORE TRACKING PATTERN, MY ORIGINAL SOLUTION WAS SO SCUFFED
 
-        # Initialize g_score (keeps track of distance to nodes)
-        g_score = {}
-        g_score[self.location] = 0
-        
-        # Priority queue
-        to_be_visited = []
-        heapq.heappush(to_be_visited, (0, self.location))
-        
-        # Track path
-        came_from = {}
-        
-        # A* algorithm
-        while to_be_visited:
-            current_f, current = heapq.heappop(to_be_visited)  # current_f not needed after pop
-            
-            if current == target:
-                return self.finish_path([], target, came_from)
-            
-            for neighbor in self.road_graph[current]:
-                heuristic = max(abs(neighbor[0] - target[0]), abs(neighbor[1] - target[1]))
-                tentative_g = g_score[current] + 1
-                
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    g_score[neighbor] = tentative_g
-                    f = tentative_g + heuristic
-                    heapq.heappush(to_be_visited, (f, neighbor))
-                    came_from[neighbor] = current
-        return []
+        start_id: int = self.road_graph.node_id[self.location]
+        target_id: int = self.road_graph.node_id.get(target, -1)
+        if target_id == -1:
+            return deque()
+
+        # A* is deterministic, so the same (start, target) pair always gives the same path. The graph keeps the most
+        # recently used ones (dicts keep insertion order, so the first key is the least recently used)
+        path_cache: dict[tuple[int, int], tuple] = self.road_graph.path_cache
+        path: tuple = path_cache.pop((start_id, target_id), None) #type: ignore
+        if path is None:
+            came_from: np.ndarray = _astar(start_id, target_id, self.road_graph.indptr, self.road_graph.indices, self.road_graph.coords)
+
+            if target_id != start_id and came_from[target_id] == -1:
+                path = ()
+            else:
+                path = tuple(self.finish_path(target_id, came_from))
+
+            if len(path_cache) >= PATH_CACHE_SIZE:
+                del path_cache[next(iter(path_cache))]
+
+        path_cache[(start_id, target_id)] = path
+
+        # paths get popped from as the agent walks them, so every agent gets its own copy
+        return deque(path)
 
     
     #Find path helper
-    def finish_path(self, completed_path: list, val: tuple, came_from: dict) -> list[tuple]:
+    def finish_path(self, target_id: int, came_from: np.ndarray) -> list[tuple]:
         """
-        Recursively reconstructs the path from target to starting location using the came_from mapping.
-        
-        Traces backwards through the came_from dictionary, building the path in reverse order,
-        then flips it to create start->target ordering.
-        
+        Reconstructs the path from target to starting location using the came_from mapping.
+
+        The walk backwards through the came_from ids runs compiled (see _walk_came_from) and comes back
+        as start->target ordered ids, so the only Python-level work is turning ids into (y, x) tuples.
+
         Args:
-            completed_path: List to accumulate path nodes during recursion (typically starts empty)
-            val: Current node being processed, begins with target location
-            came_from: Dict mapping each node to its predecessor in the optimal path
-        
+            target_id: Road graph id of the node the path ends at (the A* target)
+            came_from: Array mapping each node id to its predecessor's id in the optimal path (-1 if none)
+
         Returns:
-            list: Complete path from agent's starting location to target, ordered start->finish
+            list: Complete path of (y, x) tuples from agent's starting location to target, ordered start->finish
         """
 
-        completed_path.append(val)
-
-        if val in came_from:
-            return self.finish_path(completed_path, came_from[val], came_from)
-        else:
-            return completed_path[::-1]
+        id_node: list[tuple] = self.road_graph.id_node
+        return [id_node[node] for node in _walk_came_from(came_from, target_id).tolist()]
         
     
     @abstractmethod
@@ -170,47 +398,47 @@ class Agent(ABC):
             - Pops next waypoint from path and converts to perception coordinates
             - Checks if waypoint is within perception range (3 cells in any direction)
             - If too far off course, triggers full path recalculation
-            - Evaluates all 8 adjacent cells for the best alternative move
-            - Uses Chebyshev heuristic to stay as close to planned path as possible
+            - Evaluates adjacent cells for the best alternative move, reading the boolean perception grids
+            - Uses Chebyshev heuristic to stay as close to planned path as possible, visiting neighbours
+              closest first (NEIGHBOUR_ORDER) and stopping at the first empty one
             - Defaults to staying in place if completely surrounded
         """
         if len(self.path) <= 0:
             return self.location
 
-        # next step in the path
-        desired_loc = self.path.pop(0)
-        # translation difference
-        translation_difference: tuple = (self.location[0] - 3, self.location[1] - 3) #this agent is at the center of its perception (3,3)
-        # find desired cell within perception
-        perceived_desired_loc: tuple[int, int] = (desired_loc[0] - translation_difference[0], desired_loc[1] - translation_difference[1])
-        distance_to_loc: tuple[int, int] = (perceived_desired_loc[0] - 3, perceived_desired_loc[1] - 3)
+        # translation difference, this agent is at the center of its perception (3,3)
+        translation_y: int = self.location[0] - 3
+        translation_x: int = self.location[1] - 3
+
+        # next step in the path, found within perception
+        desired_loc: tuple = self.path.popleft()
+        perceived_y: int = desired_loc[0] - translation_y
+        perceived_x: int = desired_loc[1] - translation_x
 
-        # recalculates path if the agent strays too far from path
-        if abs(distance_to_loc[0]) >= 4 or abs(distance_to_loc[1]) >= 4:
+        # recalculates path if the agent strays too far from path (the next step is outside its 7x7 perception)
+        # A full replan is deliberate: splicing a short detour back onto the old path is cheaper, but it pulls
+        # pushed agents back into the lane they were pushed out of, which jams crowds and costs lives
+        if not (0 <= perceived_y <= 6 and 0 <= perceived_x <= 6):
             self.path = self.find_path(self.target)
-            # next step in the path
-            desired_loc = self.path.pop(0)
-            # translates the difference from the world grid to the agent's perception grid
-            translation_difference: tuple = (self.location[0] - 3, self.location[1] - 3) #this agent is at the center of its perception (3,3)
-            # find desired cell within perception
-            perceived_desired_loc: tuple[int, int] = (desired_loc[0] - translation_difference[0], desired_loc[1] - translation_difference[1])
-            distance_to_loc: tuple[int, int] = (perceived_desired_loc[0] - 3, perceived_desired_loc[1] - 3)
-
-        # list of all neighbours (around center of perception)
-        neighbours: list[tuple] = [(2, 2), (2, 3), (2, 4), (3, 2), (4, 2), (3, 4), (4, 4), (4, 3)] 
+            # next step in the path, the agent hasn't moved so the translation still holds
+            desired_loc = self.path.popleft()
+            perceived_y = desired_loc[0] - translation_y
+            perceived_x = desired_loc[1] - translation_x
+
         best_loc: tuple = (3, 3)  #default (stay in place if there are no new moves)
-        best_score: float = math.inf
 
-        # finds best empty cell using Chebyshev's heuristic
-        for cell in neighbours:
-            heuristic: float = max(abs(perceived_desired_loc[0] - cell[0]), abs(perceived_desired_loc[1] - cell[1]))
+        is_road: np.ndarray = self.perception_is_road
+        occupied: np.ndarray = self.perception_occupied
+        disaster: np.ndarray = self.perception_disaster
 
-            if heuristic < best_score:
-                if self.perception[cell[0]][cell[1]].occupant is None and self.perception[cell[0]][cell[1]].is_road and not self.perception[cell[0]][cell[1]].disaster: # type: ignore
-                    best_loc = cell
-                    best_score = heuristic
+        # finds best empty cell using Chebyshev's heuristic. Neighbours come pre-sorted closest first,
+        # so the first empty one is the best and the rest never need looking at
+        for cell in NEIGHBOUR_ORDER[perceived_y][perceived_x]:
+            if is_road[cell] and not occupied[cell] and not disaster[cell]:
+                best_loc = cell
+                break
         
-        return (best_loc[0] + translation_difference[0], best_loc[1] + translation_difference[1])
+        return (best_loc[0] + translation_y, best_loc[1] + translation_x)
 
 
 class Civilian(Agent):
@@ -239,25 +467,26 @@ class Civilian(Agent):
     encounters it, this knowledge, however, is only activated once a civilian has entered the "Flee" state
     """
 
-    # list of all safe cells on the map (cells at the edge of the map)
-    # populated by the first agent that needs it, then simply referenced by all the other ones
-    safe_cells: list = []
+    # all safe cells on the map (cells at the edge of the map) as an int32 (K, 2) array and as a set of (y, x) tuples,
+    # computed once by the World (see World.init_safe_cells), then simply referenced by every civilian
+    safe_cells_arr: np.ndarray = None #type: ignore
+    safe_cells_set: frozenset = frozenset()
 
-    #Choices of Civilian Pattern
-    class Pattern(Enum):
-        WANDER = 1
-        FLEE = 2
-        SAFE = 3
+    #Choices of Civilian Pattern (aliases of the module-level codes)
+    class Pattern(IntEnum):
+        WANDER = WANDER
+        FLEE = FLEE
+        SAFE = SAFE
     
-    #Choices of civilian state
-    class HealthState(Enum):
-        HEALTHY = 1
-        SICK = 2
-        INJURED = 3
-        GRAVELY_INJURED = 4
-        DECEASED = 5
-
-    def __init__(self, location: tuple, road_graph: dict):
+    #Choices of civilian state (aliases of the module-level codes)
+    class HealthState(IntEnum):
+        HEALTHY = HEALTHY
+        SICK = SICK
+        INJURED = INJURED
+        GRAVELY_INJURED = GRAVELY_INJURED
+        DECEASED = DECEASED
+
+    def __init__(self, location: tuple, road_graph: "RoadGraph"):
         """
         Determines the agent's next target destination based on current state.
         
@@ -270,14 +499,25 @@ class Civilian(Agent):
             - May access disaster location if agent is aware
         """
 
-        self.pattern: Civilian.Pattern = self.Pattern.WANDER
-        self.health_state: Civilian.HealthState = self.HealthState.HEALTHY
+        self.pattern: int = WANDER
+        self.health_state: int = HEALTHY
         self.max_speed: float = 0  # TODO: come up with maximum speed equation. 
         self.road_graph = road_graph
         self.time_to_worsen: float = math.inf
         self.healing: bool = False
         super().__init__(location, road_graph, self.find_target())
 
+    # written through to the AgentPool like Agent.pattern
+    @property
+    def health_state(self) -> int:
+        return self._health_state
+
+    @health_state.setter
+    def health_state(self, health_state: int) -> None:
+        self._health_state = health_state
+        if self.pool is not None:
+            self.pool.health[self.id] = health_state
+
     #updates this civilians position
     def update(self) -> None:
         """
@@ -295,29 +535,35 @@ class Civilian(Agent):
             - Recalculates path when exhausted or pattern changes
         """
 
-        if self.pattern == self.Pattern.SAFE: 
+        if self.pattern == SAFE: 
             return 
         
-        self.worsen_health()
+        # only injured civilians get worse
+        if self.health_state == INJURED or self.health_state == GRAVELY_INJURED:
+            self.worsen_health()
         
-        if self.health_state == self.HealthState.DECEASED or self.health_state == self.HealthState.GRAVELY_INJURED:
+        if self.health_state == DECEASED or self.health_state == GRAVELY_INJURED:
             return
 
-        self.check_perception()
+        # until the disaster starts nobody is fleeing, hurt or near a disaster, so perception can't change anything
+        if self.disaster_loc is not None:
+            self.check_perception()
         
         # Check if at edge (for fleeing agents)
-        if self.pattern == self.Pattern.FLEE:
-            if any(self.location[0] == edge[0] and self.location[1] == edge[1] for edge in self.safe_cells):
-                self.pattern = self.Pattern.SAFE
+        if self.pattern == FLEE:
+            if self.location in self.safe_cells_set:
+                self.pattern = SAFE
                 post("civilian safe", {"agent": self})
                 return  # Don't move anymore
         
         if self.path:
             self.location = self.follow_path()
         else:
-            if self.pattern == self.Pattern.WANDER:
+            if self.pattern == WANDER:
                 self.target = self.find_target()
-            self.path = self.find_path(self.target)
+            # already standing on the new target, try again next tick instead of planning a path nowhere
+            if self.target != self.location:
+                self.path = self.find_path(self.target)
 
     def find_target(self) -> tuple: # type: ignore
         """
@@ -326,7 +572,7 @@ class Civilian(Agent):
         Returns different targets depending on pattern:
         - WANDER: Random road cell from anywhere on the map
         - FLEE: Nearest edge cell that doesn't require moving toward the disaster.
-            Lazily initializes and caches all edge road cells on first flee.
+            Edge road cells are collected once by the World (see World.init_safe_cells).
             Filters edges based on agent's position relative to disaster to ensure
             movement is always away from danger. Uses Chebyshev distance for selection.
         - SAFE: Current location (agent has escaped and stays put)
@@ -335,50 +581,20 @@ class Civilian(Agent):
             tuple: (y, x) coordinates of the target destination
         """
 
-        road_cells = list(self.road_graph.keys())
+        # built once with the road graph, so retargeting doesn't copy every road cell into a fresh list
+        road_cells: list[tuple] = self.road_graph.id_node
 
-        if self.pattern == self.Pattern.WANDER:
-            return road_cells[random.randrange(len(road_cells))]
+        if self.pattern == WANDER:
+            return random.choice(road_cells)
         
-        elif self.pattern == self.Pattern.FLEE:
-            #check if the self.safe_cells list has been populated, if not, populate is
-            if len(self.safe_cells) == 0:
-
-                #keeps track of the largest x and y values (map edges)
-                y_size, x_size = (0, 0)
-                for cell in road_cells:
-                    y, x = cell
-
-                    if y > y_size:
-                        y_size = y
-                    if x > x_size:
-                        x_size = x
-
-                #populates slf.safe_cells with the list of valid edge cells
-                # valid edge cells are used by iterating up until y_size and x_size (which are the map edges) and checking if they exist in
-                # road_cells
-
-                for i in range(y_size + 1):
-                    if (i, x_size) in road_cells:
-                        self.safe_cells.append((i, x_size))
-                    if (i, 0) in road_cells:
-                        self.safe_cells.append((i, 0))
-                
-                for j in range(x_size + 1):
-                    if (y_size, j) in road_cells:
-                        self.safe_cells.append((y_size, j))
-
-                    if (0, j) in road_cells:
-                        self.safe_cells.append((0, j))
-                
-            
+        elif self.pattern == FLEE:
             """
             The following piece of code finds the safe_cell that is the closest to the civilian that doesn't require moving towards the catastrophe
             to reach. It does this by:
 
             1. Checking where the agent is relative to the disaster (mathematically)
             2. Filtering all safe cells 
-            3. looping through to find the closest safe cell by Chebyshev distance
+            3. picking the closest remaining safe cell by Chebyshev distance
             """
 
             # contain signs (<=, >=) that are used to filter out safe cells that will put agent in harm's way
@@ -396,32 +612,23 @@ class Civilian(Agent):
             else:
                 relative_location_x = operator.le
             
-            # filters the indices that are safe to travel towards
-            valid_indices = [edge for edge in self.safe_cells if relative_location_y(edge[0], self.location[0]) and relative_location_x(edge[1], self.location[1])]
-            
+            # filters the safe cells that are safe to travel towards, all at once
+            safe_cells: np.ndarray = self.safe_cells_arr
+            valid_cells: np.ndarray = safe_cells[relative_location_y(safe_cells[:, 0], self.location[0]) &
+                                                 relative_location_x(safe_cells[:, 1], self.location[1])]
 
-            # uses chebyshev distance to find the closest one
-            closest_safe_cell: tuple = self.location
-            min_distance: float = math.inf
-            for i in valid_indices[0]:
-                heuristic: float = max(abs(self.safe_cells[i][0] - self.location[0]), abs(self.safe_cells[i][1] - self.location[1]))
-                if  heuristic < min_distance:
-                    closest_safe_cell = self.safe_cells[i] #type: ignore
-                    min_distance = heuristic
-            
-            """ print(" ")
-            print(f"Agent at {self.location}, disaster at {self.disaster_loc}")
-            print(f"Relative: y={relative_location_y}, x={relative_location_x}")
-            print(f"Valid edges found: {len(valid_indices[0])}")
-            if len(valid_indices[0]) > 0:
-                print(f"First few valid edges: {[self.safe_cells[i] for i in valid_indices[0][:5]]}")
-            
-            print(tuple(closest_safe_cell)) """
-            
-            return tuple(closest_safe_cell)
+            # no safe cell away from the disaster, stay put
+            if len(valid_cells) == 0:
+                return self.location
+
+            # uses chebyshev distance to find the closest one (argmin keeps the first on ties)
+            distances: np.ndarray = np.maximum(np.abs(valid_cells[:, 0] - self.location[0]), np.abs(valid_cells[:, 1] - self.location[1]))
+            closest_safe_cell: np.ndarray = valid_cells[distances.argmin()]
+
+            return (int(closest_safe_cell[0]), int(closest_safe_cell[1]))
 
 
-        elif self.pattern == self.Pattern.SAFE:
+        elif self.pattern == SAFE:
             # Already safe, stay put
             return self.location
         
@@ -440,9 +647,9 @@ class Civilian(Agent):
             - May cause injury in crowd crush scenarios
         """
 
-        if self.pattern == self.Pattern.WANDER:
+        if self.pattern == WANDER:
             self.check_perception_wander()
-        elif self.pattern == self.Pattern.FLEE:
+        elif self.pattern == FLEE:
             self.check_perception_flee()
         else:
             return
@@ -463,24 +670,21 @@ class Civilian(Agent):
             Modifies this civilian's behavioral pattern.
         """
 
-        if self.pattern == self.Pattern.FLEE or self.pattern == self.Pattern.SAFE:
+        if self.pattern == FLEE or self.pattern == SAFE:
             return  # Already fleeing/safe, don't check again
 
-        num_fleeing_agents = 0
-        num_casualties = 0
-
-        for cell in self.perception.flatten():
-            if isinstance(cell.occupant, Civilian):
-                if cell.occupant.pattern == Civilian.Pattern.FLEE:
-                    num_fleeing_agents += 1
-                if cell.occupant.health_state == Civilian.HealthState.GRAVELY_INJURED or cell.occupant.health_state == Civilian.HealthState.DECEASED:
-                    num_casualties += 1
+        if self.disaster_nearby[self.location]:
+            should_flee: bool = True
+        else:
+            pool: AgentPool = self.pool
+            num_fleeing_agents, num_casualties, _ = _count_perceived_civilians(self.perception_occupant_id, pool.civilian, pool.pattern,
+                                                                               pool.health, self.id)
+            should_flee = num_fleeing_agents > 5 or num_casualties > 2
 
-            if cell.disaster or num_fleeing_agents > 5 or num_casualties > 2:
-                self.pattern = self.Pattern.FLEE
-                self.target = self.find_target()
-                self.path = self.find_path(self.target)
-                break
+        if should_flee:
+            self.pattern = FLEE
+            self.target = self.find_target()
+            self.path = self.find_path(self.target)
     
 
     # checks perception during fleeing
@@ -492,21 +696,17 @@ class Civilian(Agent):
             1. counts the number of agents arround
             2. if that number is over 20, 5% chance that the injury worsens
         """
-        total_surrounding = sum([
-            1 for cell in self.perception.flatten() 
-            if cell.occupant is not None
-            and isinstance(cell.occupant, Civilian)
-            and cell.occupant != self
-            and cell.occupant.health_state != self.HealthState.DECEASED  # Dead people can't trample
-            ])
+        pool: AgentPool = self.pool
+        # living civilians only, dead people can't trample
+        _, _, total_surrounding = _count_perceived_civilians(self.perception_occupant_id, pool.civilian, pool.pattern, pool.health, self.id)
 
         if total_surrounding >= 20:
             if random.random() <= 0.05:
-                self.set_injury(self.HealthState.INJURED)
+                self.set_injury(INJURED)
 
     
     #sets this civilian to the desired injury level
-    def set_injury(self, injury_level: HealthState) -> None:
+    def set_injury(self, injury_level: int) -> None:
         """
         Transitions civilian's health state based on injury severity and current condition.
         
@@ -526,16 +726,16 @@ class Civilian(Agent):
             - dispatches an ambulance
         """
 
-        if injury_level == self.HealthState.DECEASED or self.health_state == self.HealthState.GRAVELY_INJURED:
-            self.health_state = self.HealthState.DECEASED
+        if injury_level == DECEASED or self.health_state == GRAVELY_INJURED:
+            self.health_state = DECEASED
             post("civilian dead", {"agent": self})
             print("civilian dead")
-        elif injury_level == self.HealthState.INJURED and self.health_state == self.HealthState.HEALTHY:
-            self.health_state = self.HealthState.INJURED
+        elif injury_level == INJURED and self.health_state == HEALTHY:
+            self.health_state = INJURED
             self.worsen_health()
             print("civilian injured")
         else: 
-            self.health_state = self.HealthState.GRAVELY_INJURED
+            self.health_state = GRAVELY_INJURED
             print("civilian gravely injured")
             self.worsen_health()
             post("civilian gravely injured", {"agent": self})
@@ -563,26 +763,26 @@ class Civilian(Agent):
         time_to_death: float = 70
 
 
-        if self.health_state == self.HealthState.HEALTHY or self.health_state == self.HealthState.SICK or self.health_state == self.HealthState.DECEASED or self.healing:
+        if self.health_state == HEALTHY or self.health_state == SICK or self.health_state == DECEASED or self.healing:
             return
         
-        elif self.health_state == self.HealthState.INJURED:
+        elif self.health_state == INJURED:
             if self.time_to_worsen == math.inf:
                 self.time_to_worsen = time_to_grave_injury
 
             elif self.time_to_worsen == 0:
-                self.set_injury(self.HealthState.GRAVELY_INJURED)
+                self.set_injury(GRAVELY_INJURED)
                 self.time_to_worsen = time_to_death
 
             else:
                 self.time_to_worsen -= 1
 
-        elif self.health_state == self.HealthState.GRAVELY_INJURED:
+        elif self.health_state == GRAVELY_INJURED:
             if self.time_to_worsen == math.inf:
                 self.time_to_worsen = time_to_death
 
             elif self.time_to_worsen == 0:
-                self.set_injury(self.HealthState.DECEASED)
+                self.set_injury(DECEASED)
 
             else:
                 self.time_to_worsen -= 1
@@ -590,11 +790,12 @@ class Civilian(Agent):
 
 class Paramedic(Agent):
 
-    class Pattern(Enum):
-        STANDBY = 1
-        DISPATCHED = 2
+    #Choices of Paramedic Pattern (aliases of the module-level codes)
+    class Pattern(IntEnum):
+        STANDBY = STANDBY
+        DISPATCHED = DISPATCHED
 
-    def __init__(self, spawnable_cells: np.ndarray, hospital_location: tuple, road_graph: dict, in_danger: Civilian = None): #type: ignore
+    def __init__(self, spawnable_cells: np.ndarray, hospital_location: tuple, road_graph: "RoadGraph", in_danger: Civilian = None): #type: ignore
         """
         Initializes a Paramedic agent dispatched to help injured civilians.
         
@@ -602,9 +803,9 @@ class Paramedic(Agent):
         within the hospital's 3x3 spawn area. Immediately begins dispatch.
         
         Args:
-            spawnable_cells: 3x3 numpy array of Cell objects around hospital
+            spawnable_cells: 3x3 boolean array around hospital, True for road cells no agent stands on
             hospital_location: Tuple (y, x) of hospital center coordinates
-            road_graph: Dict mapping road cells to navigable neighbors
+            road_graph: RoadGraph of the map's road cells
             in_danger: First Civilian requiring medical attention
             
         Side Effects:
@@ -620,7 +821,7 @@ class Paramedic(Agent):
         self.first_injured_civilian: Civilian = in_danger
         self.spawnable_cells: np.ndarray = spawnable_cells
         self.spawn_location: tuple = self.spawn()
-        self.pattern = self.Pattern.DISPATCHED
+        self.pattern = DISPATCHED
 
         super().__init__(self.spawn_location, self.road_graph, self.find_target())
         self.add_to_heal_queue(in_danger)
@@ -643,10 +844,10 @@ class Paramedic(Agent):
         Priority Calculation:
             score = (0.5 * distance) + (1.0 * time_to_worsen)
         """
-        updated_heal_queue = [item for item in self.heal_queue if not (item[2].pattern == Civilian.Pattern.SAFE or 
-                                                                       item[2].health_state == Civilian.HealthState.INJURED or
-                                                                       item[2].health_state == Civilian.HealthState.HEALTHY or 
-                                                                       item[2].health_state == Civilian.HealthState.DECEASED)]
+        updated_heal_queue = [item for item in self.heal_queue if not (item[2].pattern == SAFE or 
+                                                                       item[2].health_state == INJURED or
+                                                                       item[2].health_state == HEALTHY or 
+                                                                       item[2].health_state == DECEASED)]
         self.heal_queue = updated_heal_queue
         heapq.heapify(updated_heal_queue)
 
@@ -688,8 +889,7 @@ class Paramedic(Agent):
         valid_spawn_locations = []
         for y in range(self.spawnable_cells.shape[0]):
             for x in range(self.spawnable_cells.shape[1]):
-                cell = self.spawnable_cells[y, x]
-                if cell.is_road and cell.occupant is None:
+                if self.spawnable_cells[y, x]:
                     # Convert to world coordinates
                     world_y = self.hospital_location[0] - 1 + y
                     world_x = self.hospital_location[1] - 1 + x
@@ -717,13 +917,13 @@ class Paramedic(Agent):
         """
 
         # State transitions
-        if len(self.heal_queue) < 1 and self.pattern == self.Pattern.DISPATCHED:
-            self.pattern = self.Pattern.STANDBY
+        if len(self.heal_queue) < 1 and self.pattern == DISPATCHED:
+            self.pattern = STANDBY
             self.target = self.find_target()
             self.path = self.find_path(self.target) 
         
-        elif len(self.heal_queue) > 0 and self.pattern == self.Pattern.STANDBY:
-            self.pattern = self.Pattern.DISPATCHED
+        elif len(self.heal_queue) > 0 and self.pattern == STANDBY:
+            self.pattern = DISPATCHED
             self.target = self.find_target()
             self.path = self.find_path(self.target) 
 
@@ -759,16 +959,17 @@ class Paramedic(Agent):
         if not (0 <= next_pos_translated[0] < 7 and 0 <= next_pos_translated[1] < 7):
             return
 
-        next_pos_occupant: Agent = self.perception[next_pos_translated[0]][next_pos_translated[1]].occupant #type: ignore
-
-        if next_pos_occupant is not None and isinstance(next_pos_occupant, Civilian):
+        # only civilians can be healed, the pool's civilian column answers that without fetching the occupant
+        next_pos_id: int = self.perception_occupant_id[next_pos_translated]
+        if next_pos_id != -1 and self.pool.civilian[next_pos_id]:
+            next_pos_occupant: Civilian = self.pool.agents[next_pos_id] #type: ignore
             # Check if this is our primary target (dead or alive)
             if self.heal_queue and next_pos_occupant == self.heal_queue[0][2]:
                 if self.heal(next_pos_occupant):
                     self.target = self.find_target()
                     self.path = self.find_path(self.target)
             # Otherwise, opportunistic healing for gravely injured
-            elif next_pos_occupant.health_state == Civilian.HealthState.GRAVELY_INJURED:
+            elif next_pos_occupant.health_state == GRAVELY_INJURED:
                 self.heal(next_pos_occupant)
 
 
@@ -796,9 +997,9 @@ class Paramedic(Agent):
         """
         # Check if this is our primary target AND they're still gravely injured
         if self.heal_queue and civilian == self.heal_queue[0][2]:
-            if civilian.health_state == Civilian.HealthState.GRAVELY_INJURED:
+            if civilian.health_state == GRAVELY_INJURED:
                 # Heal primary target
-                civilian.health_state = Civilian.HealthState.INJURED
+                civilian.health_state = INJURED
                 civilian.time_to_worsen = math.inf
                 civilian.healing = True
                 print(f"Paramedic healed assigned target at {civilian.location}")
@@ -809,8 +1010,8 @@ class Paramedic(Agent):
             return True
         
         # Opportunistic healing (already checks for GRAVELY_INJURED)
-        elif civilian.health_state == Civilian.HealthState.GRAVELY_INJURED and not civilian.healing:
-            civilian.health_state = Civilian.HealthState.INJURED  
+        elif civilian.health_state == GRAVELY_INJURED and not civilian.healing:
+            civilian.health_state = INJURED  
             civilian.time_to_worsen = math.inf
             civilian.healing = True
             print(f"Paramedic opportunistically healed civilian at {civilian.location}")
@@ -835,6 +1036,119 @@ class Paramedic(Agent):
         if len(self.heal_queue) > 0:
             return self.heal_queue[0][2].location
 
-        self.pattern = self.Pattern.STANDBY
+        self.pattern = STANDBY
         return self.spawn_location
-    
\ No newline at end of file
+    
+
+
+class AgentPool():
+    """
+    The AgentPool class keeps the per-tick state of every registered agent in parallel NumPy arrays (struct of arrays),
+    indexed by agent id. Agents stay ordinary objects for their own decision making, but every write to their pattern
+    or health state is mirrored here, so whole-population questions ("who still needs updating?") are a couple of
+    vectorized array operations instead of a loop over Python objects.
+
+    Properties:
+        agents -> list of registered agents, indexed by id
+        size -> number of registered agents
+        locs -> int32 (N, 2) array of agent locations, written by the World as agents move (see World.update)
+        civilian -> bool array, True for civilians (pattern values alone can't tell them from paramedics)
+        pattern -> int8 array of each agent's pattern value (Civilian.Pattern or Paramedic.Pattern)
+        health -> int8 array of each agent's Civilian.HealthState value, 0 for agents without one
+
+        #Note: only the first `size` rows are meaningful, the arrays grow by doubling as agents register
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Allocates empty columns for up to `capacity` agents.
+
+        Args:
+            capacity: Number of agents to allocate room for up front
+        """
+
+        self.agents: list[Agent] = []
+        self.size: int = 0
+        self.locs: np.ndarray = np.zeros((capacity, 2), dtype=np.int32)
+        self.civilian: np.ndarray = np.zeros(capacity, dtype=bool)
+        self.pattern: np.ndarray = np.zeros(capacity, dtype=np.int8)
+        self.health: np.ndarray = np.zeros(capacity, dtype=np.int8)
+
+    def register(self, agent: Agent) -> int:
+        """
+        Gives an agent the next free id and copies its current state into the pool.
+
+        Args:
+            agent: The agent to register
+
+        Returns:
+            int: The agent's id
+
+        Side Effects:
+            - Sets agent.id and agent.pool, so later state changes are written through
+            - Doubles the arrays if they are full
+        """
+
+        if self.size == len(self.pattern):
+            self.grow()
+
+        agent_id: int = self.size
+        self.size += 1
+        self.agents.append(agent)
+
+        agent.id = agent_id
+        agent.pool = self
+
+        # every column is written for every agent, agents without a health state get 0
+        self.locs[agent_id] = agent.location
+        self.civilian[agent_id] = isinstance(agent, Civilian)
+        self.pattern[agent_id] = agent.pattern
+        self.health[agent_id] = getattr(agent, "health_state", 0)
+
+        return agent_id
+
+    def grow(self) -> None:
+        """
+        Doubles the capacity of every column, keeping existing rows. New rows are zeroed, like a fresh pool's.
+        """
+
+        capacity: int = max(1, 2 * len(self.pattern))
+        self.locs = self._grown(self.locs, capacity)
+        self.civilian = self._grown(self.civilian, capacity)
+        self.pattern = self._grown(self.pattern, capacity)
+        self.health = self._grown(self.health, capacity)
+
+    @staticmethod
+    def _grown(column: np.ndarray, capacity: int) -> np.ndarray:
+        """
+        Returns a zeroed copy of column with room for capacity rows, holding column's rows at the start.
+        """
+
+        grown: np.ndarray = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+        grown[:len(column)] = column
+        return grown
+
+    def active_mask(self) -> np.ndarray:
+        """
+        Flags the agents that still act on the world.
+
+        Civilians that are SAFE (off the map) or DECEASED never move or change state again, so they can be skipped
+        entirely. Paramedic pattern values never equal SAFE and their health is 0, so they are always active.
+
+        Returns:
+            np.ndarray: Boolean array of length size, True for agents that need updating
+        """
+
+        pattern: np.ndarray = self.pattern[:self.size]
+        health: np.ndarray = self.health[:self.size]
+
+        return (pattern != SAFE) & (health != DECEASED)
+
+    def active_agents(self) -> list[Agent]:
+        """
+        Returns:
+            list: The agents flagged by active_mask, in id order
+        """
+
+        agents: list[Agent] = self.agents
+        return [agents[i] for i in np.flatnonzero(self.active_mask())]
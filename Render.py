@@ -64,11 +64,34 @@ for y in range(size):
 # Create world - EXACT same parameters as World.py
 world = World(num_civilians=450, num_paramedics=5, map=map_array)
 
+# Palettes for drawing the whole grid at once: cell backgrounds by code (0 road, 1 building, 2 disaster),
+# occupants by civilian health state, or PARAMEDIC. Code 0 means no occupant
+BASE_PALETTE = np.array([BLACK, GRAY, ORANGE], dtype=np.uint8)
+PARAMEDIC = 6
+OCCUPANT_PALETTE = np.zeros((PARAMEDIC + 1, 3), dtype=np.uint8)
+OCCUPANT_PALETTE[Agents.HEALTHY] = GREEN
+OCCUPANT_PALETTE[Agents.SICK] = PURPLE
+OCCUPANT_PALETTE[Agents.INJURED] = YELLOW
+OCCUPANT_PALETTE[Agents.GRAVELY_INJURED] = RED
+OCCUPANT_PALETTE[Agents.DECEASED] = DARK_RED
+OCCUPANT_PALETTE[PARAMEDIC] = BLUE
+
+# occupants are drawn 2 pixels in from the edges of their cell
+cell_pixels = np.arange(CELL_SIZE)
+inset = (cell_pixels >= 2) & (cell_pixels < CELL_SIZE - 2)
+occupant_mask = np.tile(inset[:, None] & inset[None, :], (size, size))
+
 # Pygame setup
 screen = pygame.display.set_mode((size * CELL_SIZE, size * CELL_SIZE))
 pygame.display.set_caption("Catastrophe Simulation Debug")
 clock = pygame.time.Clock()
 
+# Stats text: the font is loaded once and the lines that never change are rendered once
+font = pygame.font.Font(None, 24)
+pause_label = font.render("SPACE to pause/unpause", True, WHITE)
+disaster_pending_label = font.render("Disaster at tick 300", True, WHITE)
+disaster_active_label = font.render("DISASTER ACTIVE", True, WHITE)
+
 # Simulation state
 running = True
 paused = False
@@ -97,57 +120,31 @@ while running:
             disaster_started = True
             print("CATASTROPHE COMMENCED")
     
-    # Clear screen
-    screen.fill(BLACK)
-    
-    # Draw world
-    for y in range(size):
-        for x in range(size):
-            cell = world.map[y][x]
-            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            
-            # Draw base (road vs building)
-            if cell.disaster:
-                pygame.draw.rect(screen, ORANGE, rect)
-            elif not cell.is_road:
-                pygame.draw.rect(screen, GRAY, rect)
-            else:
-                pygame.draw.rect(screen, BLACK, rect)
-                
-            # Draw occupant
-            if cell.occupant:
-                occupant_rect = pygame.Rect(x * CELL_SIZE + 2, y * CELL_SIZE + 2, 
-                                           CELL_SIZE - 4, CELL_SIZE - 4)
-                
-                if isinstance(cell.occupant, Agents.Paramedic):
-                    pygame.draw.rect(screen, BLUE, occupant_rect)
-                elif isinstance(cell.occupant, Agents.Civilian):
-                    if cell.occupant.health_state == Agents.Civilian.HealthState.HEALTHY:
-                        color = GREEN
-                    elif cell.occupant.health_state == Agents.Civilian.HealthState.SICK:
-                        color = PURPLE
-                    elif cell.occupant.health_state == Agents.Civilian.HealthState.INJURED:
-                        color = YELLOW
-                    elif cell.occupant.health_state == Agents.Civilian.HealthState.GRAVELY_INJURED:
-                        color = RED
-                    elif cell.occupant.health_state == Agents.Civilian.HealthState.DECEASED:
-                        color = DARK_RED
-                    else:
-                        color = WHITE
-                    
-                    pygame.draw.rect(screen, color, occupant_rect)
+    # Draw world: a colour code per cell from the world's grids, expanded to pixels and blitted in one go
+    base_code = np.where(world.disaster, 2, np.where(world.is_road, 0, 1))
+    # only occupied cells are looked up in the pool, empty cells hold the -1 sentinel rather than an id
+    occupied = world.occupant_id >= 0
+    occupant_ids = world.occupant_id[occupied]
+    occupant_code = np.zeros(occupied.shape, dtype=np.uint8)
+    occupant_code[occupied] = np.where(world.pool.civilian[occupant_ids], world.pool.health[occupant_ids], PARAMEDIC)
+
+    pixels = BASE_PALETTE[base_code].repeat(CELL_SIZE, axis=0).repeat(CELL_SIZE, axis=1)
+    occupant_pixels = occupant_code.repeat(CELL_SIZE, axis=0).repeat(CELL_SIZE, axis=1)
+    drawn = occupant_mask & (occupant_pixels > 0)
+    pixels[drawn] = OCCUPANT_PALETTE[occupant_pixels[drawn]]
+
+    # surfarray is indexed (x, y)
+    pygame.surfarray.blit_array(screen, pixels.swapaxes(0, 1))
     
-    # Draw stats
-    font = pygame.font.Font(None, 24)
+    # Draw stats (only the first three lines change between frames)
     stats = [
-        f"Tick: {tick_count}",
-        f"FPS: {clock.get_fps():.1f}" if not paused else "PAUSED",
-        f"Update: {update_time:.3f}s",
-        f"SPACE to pause/unpause",
-        f"Disaster at tick 300" if not disaster_started else f"DISASTER ACTIVE"
+        font.render(f"Tick: {tick_count}", True, WHITE),
+        font.render(f"FPS: {clock.get_fps():.1f}" if not paused else "PAUSED", True, WHITE),
+        font.render(f"Update: {update_time:.3f}s", True, WHITE),
+        pause_label,
+        disaster_pending_label if not disaster_started else disaster_active_label
     ]
-    for i, stat in enumerate(stats):
-        text = font.render(stat, True, WHITE)
+    for i, text in enumerate(stats):
         screen.blit(text, (5, 5 + i * 25))
     
     pygame.display.flip()
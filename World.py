@@ -1,6 +1,8 @@
 import Agents
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import random
+import sys
 import time
 from WorldEvents import post
 from WorldHandlers import set_subscribe
@@ -23,10 +25,17 @@ The World class serves as the central coordinator, maintaining the 100x100 cell
 and orchestrating all agent behaviors during catastrophic events.
 """
 
+# draw's character for each Civilian.HealthState value, indexed by the value
+HEALTH_CHARS: np.ndarray = np.array(["?", "h", "s", "i", "G", "D"])
+
+# (dy, dx) offsets of the 8 cells around a cell, in the order init_road_graph lists a road cell's neighbours
+NEIGHBOUR_OFFSETS: tuple = ((-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, 1), (1, -1), (0, -1))
+
 class Cell():
     """
-    The Cell class represents each cell in the 100x100 grid. It stores information about what type of cell it is
-    (road or building), whether the cell is a disaster site, and which agent is currently occupying the cell.
+    The Cell class describes one cell of the map handed to World: what type of cell it is (road or building) and
+    whether the cell is a disaster site. The World reads each Cell once when it is built and keeps the grid's
+    state in its own arrays from then on (see World.init_grids), so changing a Cell afterwards has no effect.
     """
     def __init__(self, is_road: bool, disaster: bool = False):
         """
@@ -39,7 +48,46 @@ class Cell():
 
         self.is_road: bool = is_road
         self.disaster: bool = disaster
-        self.occupant: Agents.Agent = None  # type: ignore
+
+class RoadGraph(dict):
+    """
+    The RoadGraph class is the adjacency map agents pathfind over. It behaves exactly like the dict it extends
+    (road cell coordinates -> list of neighbouring road cell coordinates), and additionally gives every road cell
+    a dense integer id so pathfinding can work on plain ints instead of hashing and comparing (y, x) tuples.
+
+    Ids are handed out in row-major order, so comparing two ids orders them the same way comparing their
+    coordinate tuples would.
+
+    Properties:
+        node_id -> maps road cell coordinates (y, x) to their integer id
+        id_node -> list of road cell coordinates, indexed by integer id
+        indptr, indices -> CSR adjacency over ids: the neighbours of id i are indices[indptr[i]:indptr[i + 1]]
+        coords -> (num_nodes, 2) int32 array of road cell coordinates, indexed by integer id
+        path_cache -> most recently found paths, keyed by (start id, target id) (see Agents.Agent.find_path)
+
+        #Note: the CSR arrays exist so compiled pathfinding (see Agents._astar) can read the graph without touching Python objects
+    """
+    def __init__(self, graph: dict):
+        """
+        Wraps a finished adjacency dict and numbers its road cells.
+
+        Args:
+            graph: Dict mapping road cell coordinates to list of neighbouring road cells
+        """
+
+        super().__init__(graph)
+        self.id_node: list[tuple] = sorted(self.keys())
+        self.node_id: dict[tuple, int] = {node: i for i, node in enumerate(self.id_node)}
+
+        # neighbours are laid out back to back in id order, indptr marks where each node's run starts
+        self.indptr: np.ndarray = np.zeros(len(self.id_node) + 1, dtype=np.int32)
+        np.cumsum([len(self[node]) for node in self.id_node], out=self.indptr[1:])
+        self.indices: np.ndarray = np.fromiter((self.node_id[neighbour] for node in self.id_node for neighbour in self[node]),
+                                               dtype=np.int32, count=int(self.indptr[-1]))
+        self.coords: np.ndarray = np.array(self.id_node, dtype=np.int32).reshape(-1, 2)
+
+        # the graph never changes once built, so paths found on it stay valid
+        self.path_cache: dict[tuple[int, int], tuple] = {}
 
 class World():
     """
@@ -49,51 +97,63 @@ class World():
     Properties: 
         num_civilians -> Number of civilians on the map
         num_paramedics -> Number of paramedics on the map
-        cell_occupants -> Which cell is occupied and by which agent
-        map -> the grid map that the agents traverse along (numpy array of cells)
-        road_graph -> a graphical representation of the grid map, except only including roads. Enables pathfinding around buildings
+        road_graph -> RoadGraph, a graphical representation of the grid map, except only including roads. Enables pathfinding around buildings
         disaster_loc -> the grid-coordinate location of the catastrophe
         agents -> list of all agents
-        wall -> a cell object that represents out-of-grid cells. Cached for self.set_perception
+        pool -> AgentPool mirroring every agent's location, pattern and health (and whether it is a civilian) in NumPy arrays, indexed by agent id
         paramedics -> a complete list of all the paramedics currently on the map
         paramedic_spawn_locations -> list of paramedic spawn locations
-
-        #Note: the grid map is to be made up of a 2d numpy array of Cell objects, to help each cell store data more effectively
+        is_road, disaster -> boolean grids of which cells are roads and which are disaster sites
+        occupied -> boolean grid, True where an agent stands
+        occupant_id -> int32 grid of each cell's occupant's pool id, -1 where the cell is empty
+        safe_cells_arr -> int32 (K, 2) array of the road cells on the edge of the road network, where fleeing civilians escape the map
+        safe_cells_set -> the same cells as a frozenset of (y, x) tuples, for constant time "is this cell safe?" checks
+        padded_is_road, padded_disaster, padded_occupied, padded_occupant_id -> the same grids with a 3-cell border
+            (the perception radius) of empty building cells. The unpadded grids are views into these, so both always agree
+        windows_is_road, windows_disaster, windows_occupied, windows_occupant_id -> read-only sliding window views of the
+            padded grids: windows_*[y, x] is the 7x7 perception centred on map cell (y, x)
+        disaster_nearby -> boolean grid, True where a disaster is within the 7x7 perception centred on that cell
+
+        #Note: the map passed in is a 2d numpy array of Cell objects, read once into the grids above. Everything after
+        construction reads and writes the grids, never Cell attributes
     """
 
     def __init__(self, num_civilians: int, num_paramedics: int, map: np.ndarray, paramedic_spawn_locations: list[tuple[int, int]] = [(20, 20), (20, 40), (40, 30)]):
         self.num_civilians: int = num_civilians
         self.num_paramedics: int = num_paramedics
-        self.map: np.ndarray = map 
-        self.road_graph: dict = self.init_road_graph()
+        self.init_grids(map)
+        self.road_graph: RoadGraph = self.init_road_graph()
+        self.init_safe_cells()
         self.disaster_loc: tuple = None #type: ignore
         self.agents: list[Agents.Agent] = []
-        self.wall = Cell(False)
+        self.pool: Agents.AgentPool = Agents.AgentPool(num_civilians + num_paramedics)
         self.paramedics: list[Agents.Paramedic] = []
         self.paramedic_spawn_locations: list[tuple[int, int]] = paramedic_spawn_locations
 
         self.civilian_spawn(self.num_civilians)
 
         for y, x in self.paramedic_spawn_locations:
-            if not self.map[y][x].is_road:
+            if not self.is_road[y, x]:
                 raise ValueError(f"Hospital at {y, x} is situated on a building. Please place it on a road")
 
     
     
     # Return a hashmap of this world's traversible cells
-    def init_road_graph(self) -> dict:
+    def init_road_graph(self) -> RoadGraph:
         """
         Constructs an adjacency graph of all traversable road cells for pathfinding.
         
-        Examines each cell in the grid and, for road cells, identifies all valid 
-        neighboring road cells within a 1-cell radius (8-directional movement). 
-        The resulting graph maps each road cell's coordinates to a list of 
-        accessible neighbor coordinates.
+        Shifts the is_road grid once per direction (8-directional movement) to
+        find, for every cell at once, which neighbors are roads, then lists
+        those neighbors for the road cells only. The resulting graph maps each
+        road cell's coordinates to a list of accessible neighbor coordinates.
+        Requires init_grids to have run.
         
         Returns:
-            dict: Adjacency graph where keys are road cell coordinates (y, x) and 
+            RoadGraph: Adjacency graph where keys are road cell coordinates (y, x) and 
                 values are lists of neighboring road cell coordinates that can 
-                be reached in one move.
+                be reached in one move. Road cells are also numbered with
+                integer ids for pathfinding (see RoadGraph).
                 
         Example:
             {(0, 1): [(0, 2), (1, 1), (1, 2)],
@@ -102,110 +162,183 @@ class World():
         # container for our graph, to be filled in
         graph: dict = {}
         
-        #total possible neighbours around a cell
-        possible_neighbours: list[tuple[int, int]] = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, 1), (1, -1), (0, -1)]
+        # one shifted copy of the road grid per direction: neighbour_masks[y, x, k] is True when the k-th neighbour
+        # of (y, x) is a road. The padded border reads as building, so neighbours off the map are never roads
+        height, width = self.is_road.shape
+        neighbour_masks: np.ndarray = np.stack([self.padded_is_road[3 + dy: 3 + dy + height, 3 + dx: 3 + dx + width]
+                                                for dy, dx in NEIGHBOUR_OFFSETS], axis=-1)
+
+        #looping through road cells only (row-major, like the grid), populating graph
+        road_ys, road_xs = np.nonzero(self.is_road)
+        for y, x, is_road_neighbour in zip(road_ys.tolist(), road_xs.tolist(), neighbour_masks[road_ys, road_xs].tolist()):
+            graph[(y, x)] = [(y + dy, x + dx) for (dy, dx), is_road in zip(NEIGHBOUR_OFFSETS, is_road_neighbour) if is_road]
+        
+        return RoadGraph(graph)
 
-        #looping through cells, populating graph
-        for y in range(len(self.map)):
-            for x in range(len(self.map[y])):
-                if self.map[y][x].is_road:
-                    #All valid
-                    valid_neighbours = []
+    
+    # EFFECT: builds the grids that hold the map's state
+    def init_grids(self, map: np.ndarray) -> None:
+        """
+        Builds the grids holding the map's state from its Cell objects. The map starts with no occupants.
 
-                    for dy, dx in possible_neighbours:
-                        ny, nx = dy + y, dx + x
+        Each grid is allocated with a 3-cell border (the perception radius) so any agent's 7x7
+        perception is a plain slice of it, even at the map edge. The border behaves like
+        an out-of-map building: not a road, not a disaster, never occupied.
 
-                        if ny < self.map.shape[0] and nx < self.map.shape[1] and ny >= 0 and nx >= 0:
-                            if self.map[ny][nx].is_road:
-                                valid_neighbours.append((ny, nx))
-                    
+        Args:
+            map: 2d numpy array of Cell objects
+
+        Side Effects:
+            - Sets self.padded_is_road, self.padded_disaster, self.padded_occupied, self.padded_occupant_id
+            - Sets self.is_road, self.disaster, self.occupied, self.occupant_id as views of their interiors
+            - Sets self.windows_is_road, self.windows_disaster, self.windows_occupied, self.windows_occupant_id
+            - Sets self.disaster_nearby and shares it with every agent through Agents.Agent.disaster_nearby
+        """
+
+        height, width = map.shape
+
+        self.padded_is_road: np.ndarray = np.zeros((height + 6, width + 6), dtype=bool)
+        self.padded_disaster: np.ndarray = np.zeros((height + 6, width + 6), dtype=bool)
+        self.padded_occupied: np.ndarray = np.zeros((height + 6, width + 6), dtype=bool)
+        self.padded_occupant_id: np.ndarray = np.full((height + 6, width + 6), -1, dtype=np.int32)
+
+        self.is_road: np.ndarray = self.padded_is_road[3:-3, 3:-3]
+        self.disaster: np.ndarray = self.padded_disaster[3:-3, 3:-3]
+        self.occupied: np.ndarray = self.padded_occupied[3:-3, 3:-3]
+        self.occupant_id: np.ndarray = self.padded_occupant_id[3:-3, 3:-3]
+
+        # every 7x7 window at once, without copying. The padded grids are offset by 3, so the window starting
+        # at (y, x) in them is the one centred on map cell (y, x)
+        self.windows_is_road: np.ndarray = sliding_window_view(self.padded_is_road, (7, 7))
+        self.windows_disaster: np.ndarray = sliding_window_view(self.padded_disaster, (7, 7))
+        self.windows_occupied: np.ndarray = sliding_window_view(self.padded_occupied, (7, 7))
+        self.windows_occupant_id: np.ndarray = sliding_window_view(self.padded_occupant_id, (7, 7))
+
+        self.is_road[:] = [[cell.is_road for cell in row] for row in map]
+        self.disaster[:] = [[cell.disaster for cell in row] for row in map]
+
+        # disasters only ever appear through set_disaster_loc, so this is refreshed there rather than every tick
+        self.disaster_nearby: np.ndarray = self.windows_disaster.any(axis=(-1, -2))
+        Agents.Agent.disaster_nearby = self.disaster_nearby
+
+
+    # EFFECT: finds the cells civilians escape the map through
+    def init_safe_cells(self) -> None:
+        """
+        Collects the road cells on the outer rows and columns of the road network, where fleeing civilians are safe.
+
+        Done once here rather than by whichever civilian flees first, and shared with every civilian through
+        the Civilian class, the same way set_disaster_loc shares the disaster location.
+
+        Side Effects:
+            - Sets self.safe_cells_arr and self.safe_cells_set
+            - Sets Agents.Civilian.safe_cells_arr and Agents.Civilian.safe_cells_set
+        """
+
+        # the largest y and x any road reaches (the map edges)
+        y_size, x_size = self.road_graph.coords.max(axis=0).tolist()
+
+        safe_cells: list[tuple] = []
+        for i in range(y_size + 1):
+            if self.is_road[i, x_size]:
+                safe_cells.append((i, x_size))
+            if self.is_road[i, 0]:
+                safe_cells.append((i, 0))
+
+        for j in range(x_size + 1):
+            if self.is_road[y_size, j]:
+                safe_cells.append((y_size, j))
+            if self.is_road[0, j]:
+                safe_cells.append((0, j))
+
+        self.safe_cells_arr: np.ndarray = np.array(safe_cells, dtype=np.int32).reshape(-1, 2)
+        self.safe_cells_set: frozenset[tuple] = frozenset(safe_cells)
+
+        Agents.Civilian.safe_cells_arr = self.safe_cells_arr
+        Agents.Civilian.safe_cells_set = self.safe_cells_set
 
-                    graph[(y, x)] = valid_neighbours
-        
-        return graph
 
-    
     # EFFECT: Spawns civilians in the grid
     def civilian_spawn(self, num_civilians: int) -> None:
         """
         Spawns the specified number of civilians randomly on available road cells.
         
-        Iterates through random road positions until all agents are placed. Ensures
-        no two agents occupy the same cell during initialization. Each agent receives
-        its initial perception and movement options based on spawn location.
+        Shuffles the free road cells once and places one agent on each of the first
+        num_civilians, so no two agents occupy the same cell during initialization.
+        Each agent receives its initial perception and movement options based on
+        spawn location.
         
         Args:
             num_civilians: Number of agents to spawn
+
+        Raises:
+            ValueError: If there are fewer free road cells than civilians to spawn
         
         Side Effects:
-            - Adds civilians to self.agents list
-            - Updates cell occupancy in self.map
+            - Adds civilians to self.agents list and registers them with self.pool
+            - Updates cell occupancy in self.occupied and self.occupant_id
             - Sets initial perception for each spawned civilian
             - Sets 10% of spawned civilians to the "SICK" health state
         """
 
-        road_list: list[tuple] = list(self.road_graph.keys())
+        # every free road cell in a random order, so each civilian takes the next one instead of retrying random cells.
+        # The road graph already holds its cells as an array, so the free ones are picked out in one pass
+        road_cells: np.ndarray = self.road_graph.coords
+        free_cells: list[tuple] = list(map(tuple, road_cells[~self.occupied[road_cells[:, 0], road_cells[:, 1]]].tolist()))
+        if num_civilians > len(free_cells):
+            raise ValueError(f"Cannot spawn {num_civilians} civilians on {len(free_cells)} free road cells")
+        random.shuffle(free_cells)
 
-        while num_civilians > 0:
-            rand_num = random.randrange(0, len(road_list))
-            desired_cell = road_list[rand_num]
+        for desired_cell in free_cells[:num_civilians]:
+            new_civilian: Agents.Civilian = Agents.Civilian(desired_cell, self.road_graph)
+            self.set_perception(new_civilian)
+            self.occupied[desired_cell] = True
+            self.add_agent(new_civilian)
+            self.occupant_id[desired_cell] = new_civilian.id
 
-            if self.map[desired_cell[0], desired_cell[1]].occupant is not None: # type: ignore #checks if a cell is already occupied
-                continue
-            else:
-                new_civilian: Agents.Civilian = Agents.Civilian(desired_cell, self.road_graph)
-                self.set_perception(new_civilian)
-                self.map[desired_cell[0], desired_cell[1]].occupant = new_civilian #type: ignore
-                self.agents.append(new_civilian)
+            if random.random() <= 0.1:
+                new_civilian.health_state = Agents.SICK
 
-                if random.random() <= 0.1:
-                    new_civilian.health_state = Agents.Civilian.HealthState.SICK
 
-                num_civilians -= 1      
+    # EFFECT: adds an agent to the simulation
+    def add_agent(self, agent: Agents.Agent) -> None:
+        """
+        Adds an agent to the world's agent list and registers it with the agent pool.
+
+        Args:
+            agent: The newly created agent
+
+        Side Effects:
+            - Appends agent to self.agents
+            - Gives the agent an id in self.pool
+        """
+
+        self.agents.append(agent)
+        self.pool.register(agent)
 
 
     # EFFECT: initializes agent perception
     def set_perception(self, agent) -> None:
         """
-        Updates an agent's perception array with their surrounding environment.
+        Points an agent's perception at their surrounding environment.
         
-        Extracts a 7x7 grid centered on the agent's current position, giving them
-        visibility 3 cells in each direction. Handles edge cases where agents are
-        near map boundaries by numpy's automatic bounds clipping.
+        Takes the 7x7 window centered on the agent's current position, giving them
+        visibility 3 cells in each direction. The grids' 3-cell border covers agents
+        near the map boundaries, so the window never needs clipping or padding.
         
         Args:
             agent: The agent whose perception needs updating
         
         Side Effects:
-            - Updates agent.perception with current surrounding grid
+            - Updates agent.perception_is_road, perception_disaster, perception_occupied and perception_occupant_id
+              with views of the window in the world's grids (no copy)
         """
         y, x = agent.location
-        
-        # Track the actual slice boundaries
-        y_start:int = max(0, y - 3)
-        y_end: int = min(self.map.shape[0], y + 4)
-        x_start: int = max(0, x - 3)
-        x_end: int = min(self.map.shape[1], x + 4)
-        
-        perception = self.map[y_start:y_end, x_start:x_end]
-
-        y_start_pad: int = 0
-        y_end_pad: int = 0
-        x_start_pad: int = 0
-        x_end_pad: int = 0
-
-        if y_start == 0:
-            y_start_pad = -(y-3)
-        if x_start == 0:
-            x_start_pad = -(x-3)
-        if y_end == self.map.shape[0]:
-            y_end_pad = (y+4) - self.map.shape[0]
-        if x_end == self.map.shape[1]:
-            x_end_pad = (x+4) - self.map.shape[1]
-
-        padded_perception = np.pad(perception, ((y_start_pad, y_end_pad), (x_start_pad, x_end_pad)), mode="constant", constant_values= self.wall) # type: ignore
-        
-        agent.perception = padded_perception
+
+        agent.perception_is_road = self.windows_is_road[y, x]
+        agent.perception_disaster = self.windows_disaster[y, x]
+        agent.perception_occupied = self.windows_occupied[y, x]
+        agent.perception_occupant_id = self.windows_occupant_id[y, x]
 
 
     #sets the location of a disaster
@@ -220,13 +353,14 @@ class World():
             loc: Tuple (y, x) coordinates of disaster epicenter
             
         Side Effects:
-            - Sets cell.disaster to True at location
+            - Sets self.disaster to True at location, refreshing self.disaster_nearby
             - Updates Agent.disaster_loc class variable
             - Posts "disaster_start" event with world and location
         """
          
         self.disaster_loc = loc
-        self.map[loc[0]][loc[1]].disaster = True #type: ignore
+        self.disaster[loc] = True
+        self.disaster_nearby[:] = self.windows_disaster.any(axis=(-1, -2))
         Agents.Agent.disaster_loc = loc
         post("disaster_start", {"world": self, "disaster_location": loc})
 
@@ -236,34 +370,44 @@ class World():
         """
         Executes one simulation tick, updating all agent positions and states.
         
-        For each agent: captures current position, calls agent's update method
-        (which may change position), updates grid occupancy, refreshes perception
-        based on new position, and updates available movement options. Does not
-        handle collision detection in current implementation.
+        For each active agent (see AgentPool.active_mask): captures current position, calls agent's update method
+        (which may change position), and if the agent moved or left the map updates grid
+        occupancy and points its perception at its new position. Agents move one at a time,
+        so each sees the moves made before it this tick.
         
         Side Effects:
-            - Refreshes agent perceptions
+            - Refreshes the perceptions of agents that moved
             - Updates all agent positions
-            - Updates cell occupancy in self.map
+            - Updates cell occupancy in self.occupied and self.occupant_id, and moved agents' rows of self.pool.locs
         
         INTERESTING TEST:
             Traffic tends to cluster near the upper left corner of the map, does shuffling the order of agent operations on each tick change that?
             Answer, yes. processing order was biased towards the left, after I implemented the change, traffic starte concentrating towards the upper center of the map.
         """
 
-        random.shuffle(self.agents)
-
-        for agent in self.agents:
-            self.set_perception(agent)
+        # safe and deceased civilians can't act anymore, the pool filters them out in one vectorized pass
+        active_agents: list[Agents.Agent] = self.pool.active_agents()
+        random.shuffle(active_agents)
 
+        for agent in active_agents:
             old_loc = agent.location
             agent.update()
             new_loc = agent.location
 
-            self.map[old_loc[0], old_loc[1]].occupant = None # type: ignore
+            # an agent that stayed put on its own cell still occupies it, and its perception views (live views of the grids,
+            # see set_perception) already show everything that moved around it. Paramedics spawned mid-tick only take
+            # their cell on their first update, so the grid is checked rather than assumed
+            if new_loc == old_loc and agent.pattern != Agents.SAFE and self.occupant_id[old_loc] == agent.id:
+                continue
+
+            self.occupied[old_loc] = False
+            self.occupant_id[old_loc] = -1
 
-            if agent.pattern is not Agents.Civilian.Pattern.SAFE: #type: ignore
-                self.map[new_loc[0], new_loc[1]].occupant = agent # type: ignore
+            if agent.pattern != Agents.SAFE:
+                self.occupied[new_loc] = True
+                self.occupant_id[new_loc] = agent.id
+                self.pool.locs[agent.id] = new_loc
+                self.set_perception(agent)
 
 
     def draw(self) -> None:
@@ -281,50 +425,23 @@ class World():
         - 'P' represents paramedics
         - 'X' represents disaster location
         """
-        print("\n" + "="*50)  # Separator line
-        print("  ", end="")
-        
-        # Print column numbers (every 5th for readability)
-        for x in range(len(self.map[0])):
-            if x % 5 == 0:
-                print(f"{x:2}", end="")
-            else:
-                print("  ", end="")
-        print()
-        
-        # Print each row
-        for y in range(len(self.map)):
-            print(f"{y:2} ", end="")  # Row number with padding
-            
-            for x in range(len(self.map[y])):
-                cell = self.map[y][x]
-                
-                # Check if this is disaster location
-                if cell.disaster:
-                    print("X ", end="")
-                elif not cell.is_road:
-                    print("█ ", end="")
-                elif cell.occupant is None:
-                    print("  ", end="")  # Empty space instead of dot
-                elif isinstance(cell.occupant, Agents.Paramedic):
-                    print("P ", end="")  # Paramedic
-                elif isinstance(cell.occupant, Agents.Civilian):
-                    health = cell.occupant.health_state
-                    if health == Agents.Civilian.HealthState.HEALTHY:
-                        print("h ", end="")
-                    elif health == Agents.Civilian.HealthState.SICK:
-                        print("s ", end="")
-                    elif health == Agents.Civilian.HealthState.INJURED:
-                        print("i ", end="")
-                    elif health == Agents.Civilian.HealthState.GRAVELY_INJURED:
-                        print("G ", end="")
-                    elif health == Agents.Civilian.HealthState.DECEASED:
-                        print("D ", end="")
-                    else:
-                        print("? ", end="")
-                else:
-                    print("? ", end="")
-            print()
+        occupied: np.ndarray = self.occupant_id >= 0
+        # only occupied cells are looked up in the pool, empty cells hold the -1 sentinel rather than an id
+        occupant_ids: np.ndarray = self.occupant_id[occupied]
+
+        # one character per cell, picked for the whole grid at once (disaster over building over occupant)
+        cell_chars: np.ndarray = np.full(occupied.shape, " ")  # Empty space instead of dot
+        cell_chars[occupied] = np.where(self.pool.civilian[occupant_ids], HEALTH_CHARS[self.pool.health[occupant_ids]], "P")
+        cell_chars = np.where(self.is_road, cell_chars, "█")
+        cell_chars = np.where(self.disaster, "X", cell_chars)
+
+        # Column numbers (every 5th for readability), then each row with its row number
+        lines: list[str] = ["", "=" * 50]  # Separator line
+        lines.append("  " + "".join(f"{x:2}" if x % 5 == 0 else "  " for x in range(cell_chars.shape[1])))
+        for y, row in enumerate(cell_chars.tolist()):
+            lines.append(f"{y:2} " + "".join(char + " " for char in row))
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__": 
     # Generate a 70x70 city grid with multi-lane roads
@@ -1,5 +1,6 @@
-# Dictionary of Subscribers to certain events
-subscribers = {} #empty, will be added to when needed
+# Dictionary of Subscribers to certain events. Each event's handlers are kept in a tuple that subscribe replaces
+# rather than edits, so a handler subscribing while an event is being posted can't change the handlers being called
+subscribers: dict[str, tuple] = {} #empty, will be added to when needed
 
 # adds a subscriber to an event
 def subscribe(event_name: str, func) -> None:
@@ -18,11 +19,10 @@ def subscribe(event_name: str, func) -> None:
     """
     
     #if an event doesn't exist and someone wants to subscribe to it, the event is created
-    if event_name not in subscribers :
-        subscribers[event_name] = []
+    handlers: tuple = subscribers.get(event_name, ())
 
-    if func not in subscribers[event_name]:
-        subscribers[event_name].append(func)
+    if func not in handlers:
+        subscribers[event_name] = handlers + (func,)
 
 # posts an event (alerts all subscribers)
 def post(event_name: str, data: dict) :
@@ -43,8 +43,5 @@ def post(event_name: str, data: dict) :
 
     #if an event doesn't exist and someone wants to post it, nothing is done.
     #ensures our subscribers dict isn't full of unused events
-    if event_name not in subscribers :
-        return
-
-    for func in subscribers[event_name] :
+    for func in subscribers.get(event_name, ()) :
         func(data)
\ No newline at end of file
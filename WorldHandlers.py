@@ -26,6 +26,11 @@ healed_civilians: int = 0
 dead_civilians: int = 0
 safe_civilians: int = 0
 
+# the cells of the 7x7 area around a disaster (disaster at (3, 3)) immediately next to the disaster site, any
+# civilian in one of these cells dies
+DEATH_RADIUS: np.ndarray = np.zeros((7, 7), dtype=bool)
+DEATH_RADIUS[2:5, 2:5] = True
+
 
 def injure_near_disaster(data: dict) -> None:
 
@@ -54,39 +59,26 @@ def injure_near_disaster(data: dict) -> None:
     world = data["world"]
     location: tuple = data["disaster_location"]
 
-    # slice the map to get the area around the disaster site (disaster should end up at (3, 3))
-    area_around_disaster: np.ndarray = world.map[location[0] - 3: location[0] + 4, location[1] - 3: location[1] + 4]
-
-    # all the cells immediately next to the disaster site, any agent in one of these cells will die (RIP)
-    death_radius: list[tuple] = [(2, 2), (2, 3), (2, 4), (3, 2), (4, 2), (3, 4), (4, 4), (4, 3), (3, 3)]
-
-    # loop through all the cells surrounding the disaster, killing or injuring agents
-    # nested loop to keep track of coordinates
-    for i in range(len(area_around_disaster)):
-        for j in range(len(area_around_disaster[i])):
-            cell = area_around_disaster[i][j]
-
-            # if a cell is a building, skip, cuz we can't kill or injure buildings
-            if not cell.is_road:
-                continue
+    # the 7x7 window of occupant ids centred on the disaster site (disaster ends up at (3, 3)). Buildings and cells
+    # beyond the map edge are never occupied, so every id found is an agent standing on a road
+    area_around_disaster: np.ndarray = world.windows_occupant_id[location]
 
-            if cell.occupant is not None:
-                # defensive redundency check, there should be nothing BUT civilians on the map at this point
-                if isinstance(cell.occupant, Agents.Civilian):
-                    # kills any civilians inside death radius
-                    if (i, j) in death_radius:
-                        cell.occupant.set_injury(Agents.Civilian.HealthState.DECEASED)
+    # cells holding a civilian. Defensive redundency check, there should be nothing BUT civilians on the map at this point
+    civilians: np.ndarray = area_around_disaster >= 0
+    civilians[civilians] = world.pool.civilian[area_around_disaster[civilians]]
 
-                    else:
-                        chance: float = random.random()
+    # every civilian's fate is decided up front: civilians inside the death radius die (RIP), and half of the civilians
+    # outside it are injured while the other half are gravely injured. Rolls are drawn in row-major order
+    survivors: np.ndarray = civilians & ~DEATH_RADIUS
+    chances: np.ndarray = np.zeros((7, 7))
+    chances[survivors] = [random.random() for _ in range(np.count_nonzero(survivors))]
+    injury_levels: np.ndarray = np.where(DEATH_RADIUS, Agents.DECEASED,
+                                         np.where(chances <= 0.5, Agents.INJURED, Agents.GRAVELY_INJURED))
 
-                        # injures half of civilians outside blast radius
-                        if chance <= 0.5:
-                            cell.occupant.set_injury(Agents.Civilian.HealthState.INJURED)
-                        
-                        # gravely injures half of civilians outside blast radius
-                        else:
-                            cell.occupant.set_injury(Agents.Civilian.HealthState.GRAVELY_INJURED)
+    # apply the injuries, only visiting the cells that hold a civilian
+    for i, j in np.argwhere(civilians).tolist():
+        civilian: Agents.Civilian = world.pool.agents[area_around_disaster[i, j]] #type: ignore
+        civilian.set_injury(int(injury_levels[i, j]))
 
 def dispatch_paramedic(data: dict) -> None:
     """
@@ -138,7 +130,7 @@ def spawn_paramedic(agent):
         
     Side Effects:
         - Creates new Paramedic instance
-        - Adds paramedic to world.paramedics and world.agents
+        - Adds paramedic to world.paramedics and world.agents (registering it with world.pool)
         - Sets initial perception for new paramedic
         - Falls back to select_paramedic if spawn fails
     """
@@ -159,15 +151,19 @@ def spawn_paramedic(agent):
         
         try:
             spawn_location = sorted_spawn_locations.pop(0)
-            spawnable_cells = world.map[spawn_location[0] - 1: spawn_location[0] + 2, 
-                                        spawn_location[1] - 1: spawn_location[1] + 2]
+            # the 3x3 area around the hospital, read from the padded grids (offset by 3) so a hospital on the map edge
+            # gets building cells past the edge instead of a slice that wraps or comes back empty
+            spawnable_cells = world.padded_is_road[spawn_location[0] + 2: spawn_location[0] + 5, 
+                                                   spawn_location[1] + 2: spawn_location[1] + 5] & \
+                              ~world.padded_occupied[spawn_location[0] + 2: spawn_location[0] + 5, 
+                                                     spawn_location[1] + 2: spawn_location[1] + 5]
             new_paramedic = Paramedic(spawnable_cells, spawn_location, world.road_graph, agent)
         except:
             print("Paramedic failed to spawn, trying again")
             spawn_paramedic_inner()
         else:
             world.paramedics.append(new_paramedic)
-            world.agents.append(new_paramedic)
+            world.add_agent(new_paramedic)
             world.set_perception(new_paramedic)
             print("Paramedic successfully spawned")
     
@@ -0,0 +1,64 @@
+import numpy as np
+import Agents
+from World import World, Cell
+
+
+def make_world(num_civilians: int) -> World:
+    """
+    Builds a small all-road world whose AgentPool is exactly full once its civilians have spawned.
+    """
+    size = 10
+    map_array = np.empty((size, size), dtype=object)
+    for y in range(size):
+        for x in range(size):
+            map_array[y, x] = Cell(True)
+
+    return World(num_civilians=num_civilians, num_paramedics=0, map=map_array, paramedic_spawn_locations=[(5, 5)])
+
+
+def test_grow_zeroes_new_rows():
+    world = make_world(2)
+    pool = world.pool
+    pool.health[:pool.size] = Agents.DECEASED
+
+    pool.grow()
+
+    assert len(pool.pattern) == 4
+    assert not pool.civilian[2:].any()
+    assert (pool.pattern[2:] == 0).all()
+    assert (pool.health[2:] == 0).all()
+
+
+def test_paramedic_registered_after_growth():
+    world = make_world(2)
+    pool = world.pool
+    civilian = world.agents[0]
+    # a DECEASED row that np.resize would have copied into the grown arrays
+    civilian.health_state = Agents.DECEASED
+
+    spawnable_cells = world.is_road[4:7, 4:7] & ~world.occupied[4:7, 4:7]
+    paramedic = Agents.Paramedic(spawnable_cells, (5, 5), world.road_graph, world.agents[1])
+    world.add_agent(paramedic)
+
+    assert len(pool.pattern) > 2
+    assert not pool.civilian[paramedic.id]
+    assert pool.health[paramedic.id] == 0
+    assert pool.pattern[paramedic.id] == paramedic.pattern
+    assert paramedic in pool.active_agents()
+
+
+def test_register_overwrites_every_column():
+    world = make_world(2)
+    pool = world.pool
+    pool.grow()
+    # leftovers a register that skips columns would leave behind
+    pool.civilian[2:] = True
+    pool.health[2:] = Agents.DECEASED
+
+    spawnable_cells = world.is_road[4:7, 4:7] & ~world.occupied[4:7, 4:7]
+    paramedic = Agents.Paramedic(spawnable_cells, (5, 5), world.road_graph, world.agents[1])
+    world.add_agent(paramedic)
+
+    assert not pool.civilian[paramedic.id]
+    assert pool.health[paramedic.id] == 0
+    assert paramedic in pool.active_agents()
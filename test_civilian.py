@@ -0,0 +1,72 @@
+import numpy as np
+import Agents
+from World import World, Cell
+
+
+def make_world(road: np.ndarray, num_civilians: int = 5) -> World:
+    map_array = np.empty(road.shape, dtype=object)
+    for y in range(road.shape[0]):
+        for x in range(road.shape[1]):
+            map_array[y, x] = Cell(bool(road[y, x]))
+
+    hospital = tuple(np.argwhere(road)[0].tolist())
+    return World(num_civilians=num_civilians, num_paramedics=2, map=map_array, paramedic_spawn_locations=[hospital])
+
+
+def nearest_safe_cell(location: tuple, disaster: tuple, safe_cells: np.ndarray) -> tuple:
+    """
+    Brute force version of Civilian.find_target's FLEE branch: the Chebyshev-nearest safe cell (first one on ties)
+    that lies on the far side of the civilian from the disaster, or the civilian's own location if there is none.
+    """
+    best, best_distance = location, None
+    for y, x in safe_cells.tolist():
+        away_y = y >= location[0] if disaster[0] <= location[0] else y <= location[0]
+        away_x = x >= location[1] if disaster[1] <= location[1] else x <= location[1]
+        if not (away_y and away_x):
+            continue
+        distance = max(abs(y - location[0]), abs(x - location[1]))
+        if best_distance is None or distance < best_distance:
+            best, best_distance = (y, x), distance
+    return best
+
+
+def test_flee_target_is_nearest_edge_away_from_disaster():
+    size = 30
+    road = np.zeros((size, size), dtype=bool)
+    road[::5, :] = True
+    road[:, ::5] = True
+    road[:, size - 1] = True
+    road[size - 1, :] = True
+    world = make_world(road)
+    world.set_disaster_loc((12, 17))
+
+    civilian: Agents.Civilian = world.agents[0] #type: ignore
+    civilian.pattern = Agents.FLEE
+    safe_cells = world.safe_cells_arr
+    edge = {(y, x) for y, x in safe_cells.tolist()}
+
+    for location in map(tuple, np.argwhere(road).tolist()):
+        civilian.location = location
+        target = civilian.find_target()
+
+        assert target == nearest_safe_cell(location, (12, 17), safe_cells)
+        assert target in edge
+
+
+def test_flee_without_safe_cell_away_from_disaster_stays_put():
+    # roads along the top row and left column only, plus one road cell in the middle: every edge cell is above or
+    # left of it, so fleeing down and right from a disaster up and to its left leaves nowhere to go
+    size = 10
+    road = np.zeros((size, size), dtype=bool)
+    road[0, :] = True
+    road[:, 0] = True
+    road[5, 5] = True
+    world = make_world(road, num_civilians=1)
+    world.set_disaster_loc((2, 2))
+
+    civilian: Agents.Civilian = world.agents[0] #type: ignore
+    civilian.pattern = Agents.FLEE
+    civilian.location = (5, 5)
+
+    assert nearest_safe_cell((5, 5), (2, 2), world.safe_cells_arr) == (5, 5)
+    assert civilian.find_target() == (5, 5)
@@ -0,0 +1,34 @@
+import numpy as np
+from World import World, Cell
+
+
+def test_draw_with_empty_pool(capsys):
+    size = 10
+    map_array = np.empty((size, size), dtype=object)
+    for y in range(size):
+        for x in range(size):
+            map_array[y, x] = Cell(y % 5 == 0 or x % 5 == 0)
+
+    world = World(num_civilians=0, num_paramedics=0, map=map_array, paramedic_spawn_locations=[(5, 5)])
+    assert len(world.pool.civilian) == 0
+
+    world.draw()
+
+    rows = capsys.readouterr().out.splitlines()[3:]
+    assert len(rows) == size
+    assert rows[1] == " 1 " + "".join("  " if x % 5 == 0 else "█ " for x in range(size))
+
+
+def test_pool_locs_follow_agents():
+    size = 10
+    map_array = np.empty((size, size), dtype=object)
+    for y in range(size):
+        for x in range(size):
+            map_array[y, x] = Cell(True)
+
+    world = World(num_civilians=20, num_paramedics=0, map=map_array, paramedic_spawn_locations=[(5, 5)])
+    for _ in range(10):
+        world.update()
+
+    pool = world.pool
+    assert [tuple(loc) for loc in pool.locs[:pool.size].tolist()] == [agent.location for agent in world.agents]